@@ -1,10 +1,21 @@
 #!/usr/bin/env python3
+import os
+import re
 import sys
+import pickle
+import hashlib
+import tempfile
 import subprocess
 import datetime
 import argparse
-from collections import defaultdict
-from typing import List, Dict, Set, Tuple, Optional
+import array
+import heapq
+from collections import defaultdict, deque
+from contextlib import nullcontext
+from multiprocessing import Pool
+from itertools import islice, takewhile
+from operator import attrgetter, itemgetter
+from typing import List, Dict, Set, Tuple, Optional, NamedTuple, Sequence
 
 # Add at the top of the file
 COCOMO_ORGANIC_A = 2.4
@@ -13,6 +24,19 @@ DAYS_PER_MONTH = 30.44
 DAYS_PER_WEEK = 7
 DAYS_PER_YEAR = 365
 
+# Parsed git log results are cached per repository and options, bump the
+# version whenever the cached data layout changes. Entries unused for
+# CACHE_MAX_AGE_DAYS are removed.
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"), "git_summary"
+)
+CACHE_VERSION = 5
+CACHE_MAX_AGE_DAYS = 30
+
+# Line counts of a `git log --shortstat` summary line
+SHORTSTAT_INSERTIONS_RE = re.compile(rb"(\d+) insertion")
+SHORTSTAT_DELETIONS_RE = re.compile(rb"(\d+) deletion")
+
 COMMIT_CATEGORIES = {
     "Fixes": ["fix", "bug", "issue"],
     "Features": ["feat", "add", "new"],
@@ -21,6 +45,13 @@ COMMIT_CATEGORIES = {
     "Documentation": ["doc"],
 }
 
+# Keyword regexes of COMMIT_CATEGORIES, tried in order on the lowercased
+# subject so the first category with a keyword anywhere in it wins
+CATEGORY_RES = tuple(
+    (category, re.compile("|".join(map(re.escape, keywords))))
+    for category, keywords in COMMIT_CATEGORIES.items()
+)
+
 
 # ANSI color codes
 class Colors:
@@ -32,6 +63,38 @@ class Colors:
     RESET = "\033[0m"
 
 
+class Commit(NamedTuple):
+    """A commit as read from git log, with its line count totals"""
+
+    hash: str
+    subject: str
+    date: str
+    email: str
+    added: int
+    deleted: int
+
+
+class ParsedCommit(NamedTuple):
+    """A commit with the fields derived for the summary"""
+
+    hash: str
+    subject: str
+    date: datetime.date
+    added: int
+    deleted: int
+    category: str
+
+    # Line count figures are cheap to derive, so they are computed when read
+    # rather than stored in every commit
+    @property
+    def changes(self) -> int:
+        return self.added + self.deleted
+
+    @property
+    def total_impact(self) -> int:
+        return max(0, self.added - self.deleted)
+
+
 def parse_args():
     """Parse command line arguments"""
     parser = argparse.ArgumentParser(description="Generate a summary of git commits")
@@ -66,7 +129,15 @@ def parse_args():
         "-dl",
         type=int,
         default=1,
-        help="Directory depth level for impact analysis (default: 1)",
+        help="Directory depth level for impact analysis, 0 to skip it (default: 1)",
+    )
+
+    # Path filter option
+    parser.add_argument(
+        "--paths",
+        "-P",
+        nargs="+",
+        help="Only consider changes to these paths",
     )
 
     # Branch comparison option
@@ -101,53 +172,173 @@ def parse_args():
         help="Display incremental COCOMO metrics (each commit added net lines contribute to total line count)",
     )
 
+    # Parsing option
+    parser.add_argument(
+        "--jobs",
+        "-j",
+        type=int,
+        default=1,
+        help="Number of processes parsing the git log output (default: 1)",
+    )
+
+    # Cache option
+    parser.add_argument(
+        "--no-cache",
+        "-nc",
+        action="store_true",
+        help="Don't read or write the cache of parsed git log results",
+    )
+
     return parser.parse_args()
 
 
-def progressbar(it, prefix="", size=60, out=sys.stdout):
-    """Given an iterable `it`, display a progress bar as `it` is consumed"""
-    count = len(it)
+def progressbar(it, prefix="", size=60, out=sys.stdout, total=None, every=1000):
+    """Given an iterable `it`, display a progress bar as `it` is consumed
 
-    def show(j):
-        x = int(size * j / count)
-        print(
-            f"{prefix}{'█'*x}{('.'*(size-x))} {j}/{count}",
-            end="\r",
-            flush=True,
-        )
+    When `total` is not given and `it` has no length (e.g. a stream), a
+    spinner and the number of consumed items are displayed instead. The bar is
+    only redrawn when it grows, or every `every` items without a total, and
+    isn't displayed at all when `out` isn't a terminal.
+    """
+    if not out.isatty():
+        yield from it
+        return
+    if total is None and hasattr(it, "__len__"):
+        total = len(it)
+    count = 0
 
+    def show(j):
+        if total:
+            x = int(size * j / total)
+            status = f"{'█'*x}{('.'*(size-x))} {j}/{total}"
+        else:
+            spinner = "|/-\\"[j // every % 4]
+            status = f"{spinner} {j}"
+        out.write(f"{prefix}{status}\r")
+        out.flush()
+
+    # Redraw about once per bar cell
+    step = max(1, total // size) if total else every
     show(0)
-    for i, item in enumerate(it):
+    for count, item in enumerate(it, 1):
         yield item
-        show(i + 1)
-    print(
-        f"{(' '*(size+len(prefix)+len(str(count))*2+2))}",
-        end="\r",
-        flush=True,
+        if count % step == 0:
+            show(count)
+    width = size + len(str(total)) * 2 + 2 if total else len(str(count)) + 2
+    out.write(f"{(' '*(width+len(prefix)))}\r")
+    out.flush()
+
+
+def get_email_contains_pattern(text):
+    """Get a git --author basic regexp matching emails that contain `text`"""
+    # The author is matched as "Name <email>", stay between the angle brackets
+    escaped = re.sub(r"([.[\\*^$])", r"\\\1", text)
+    return f"<[^>]*{escaped}[^>]*>"
+
+
+def resolve_revisions(revisions: List[str]) -> Optional[str]:
+    """Resolve HEAD and `revisions` to commit hashes, None if one can't be"""
+    result = subprocess.run(
+        ["git", "rev-parse", "HEAD", *revisions], capture_output=True, text=True
     )
+    if result.returncode != 0:
+        return None
+    return result.stdout
+
+
+def get_cache_path(cmd: List[str]) -> str:
+    """Get the cache file for the results of a git log command
+
+    There is a single file per command and directory, so results for a new
+    history replace the previous ones.
+    """
+    # Pathspecs are relative to the current directory
+    key = repr((CACHE_VERSION, os.getcwd(), cmd))
+    digest = hashlib.blake2b(key.encode(), digest_size=16).hexdigest()
+    return os.path.join(CACHE_DIR, f"{digest}.pkl")
+
+
+def get_cache_stamp(cmd: List[str], heads: str) -> Tuple[str, Optional[str]]:
+    """Get what cached results of a git log command are only valid for
+
+    That is the `heads` commit hashes the log starts from, so any new commit
+    invalidates them, and the current hour when the log has a relative
+    --since date, which moves with the clock.
+    """
+    hour = datetime.datetime.now().strftime("%Y-%m-%dT%H") if "--since" in cmd else None
+    return heads, hour
+
+
+def load_cache(path: str, stamp):
+    """Load cached results, None if they are missing, stale or unreadable"""
+    try:
+        with open(path, "rb") as f:
+            # The stamp is stored first, so stale results aren't unpickled
+            if pickle.load(f) != stamp:
+                return None
+            data = pickle.load(f)
+        # Mark the entry as used so it isn't pruned
+        os.utime(path)
+        return data
+    except Exception:
+        return None
 
 
-def get_emails_by_pattern(pattern):
-    """Get all email addresses from git log that contain the given pattern"""
-    cmd = ["git", "log", "--format=%ae"]
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    all_emails = set(result.stdout.strip().split("\n"))
-    return [e for e in all_emails if pattern in e]
+def save_cache(path: str, stamp, data) -> None:
+    """Atomically write results to the cache and prune it, ignoring failures"""
+    try:
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        with tempfile.NamedTemporaryFile(
+            dir=os.path.dirname(path), suffix=".tmp", delete=False
+        ) as f:
+            pickle.dump(stamp, f, protocol=pickle.HIGHEST_PROTOCOL)
+            pickle.dump(data, f, protocol=pickle.HIGHEST_PROTOCOL)
+        os.replace(f.name, path)
+        prune_cache(os.path.dirname(path))
+    except OSError:
+        pass
+
+
+def prune_cache(cache_dir: str) -> None:
+    """Remove cache entries that weren't used for CACHE_MAX_AGE_DAYS"""
+    expiry = datetime.datetime.now().timestamp() - CACHE_MAX_AGE_DAYS * 86400
+    with os.scandir(cache_dir) as entries:
+        for entry in entries:
+            try:
+                if entry.stat().st_mtime < expiry:
+                    os.remove(entry.path)
+            except OSError:
+                pass
 
 
 def get_user_commits(
     emails: Optional[List[str]] = None,
+    email_contains: Optional[str] = None,
     days: Optional[int] = None,
     weeks: Optional[int] = None,
     months: Optional[int] = None,
     years: Optional[int] = None,
-    with_files: bool = False,
     diverged_from: Optional[str] = None,
-) -> Tuple[List[Dict], Set[str]]:
-    """Get all commits by specified emails or current user within time period"""
+    paths: Optional[List[str]] = None,
+    use_cache: bool = True,
+    numstat: bool = True,
+    jobs: int = 1,
+) -> Tuple[List[Commit], Dict[str, Sequence], Set[str]]:
+    """Get all commits by specified emails or current user within time period
+
+    File changes are returned separately as a table with one sequence per column
+    ("name", "added" and "deleted"), one row per changed file of every commit.
+    The name column is a list, the line count columns are integer arrays.
+    Without `numstat`, git only reports per commit totals and the table is empty.
+    The output is parsed by `jobs` processes. Raises CalledProcessError with
+    git's error output if git log fails.
+    """
     # Track which emails actually have commits
     active_emails = set()
     all_commits = []
+    # Line counts are stored as typed arrays, much more compact than lists of
+    # int objects and quicker to cache
+    files = {"name": [], "added": array.array("q"), "deleted": array.array("q")}
 
     # Build time period argument
     time_arg = []
@@ -160,125 +351,226 @@ def get_user_commits(
     elif years:
         time_arg = ["--since", f"{years} years ago"]
 
-    # If no specific emails, get all commits
-    if not emails:
-        author_args = []
-    else:
-        # Fix: Use --author= format and handle multiple emails with OR operator
-        author_str = "\\|".join(emails)  # Use OR operator in git --author
-        author_args = [f"--author={author_str}"]
-
-    # Get commit info
-    format_str = "--pretty=format:%H<sep>%s<sep>%ad<sep>%ae" + (
-        "<sep>%b" if with_files else ""
-    )
-    cmd = ["git", "log", format_str, "--date=short", "--numstat"]
+    # If no specific emails, get all commits. Git ORs repeated --author
+    # options, so every email is matched in a single history walk.
+    author_args = [arg for email in emails or [] for arg in ("--author", email)]
+    if email_contains:
+        author_args = ["--author", get_email_contains_pattern(email_contains)]
+
+    # Get commit info. With -z, header fields, numstat records and commits are
+    # all NUL terminated, and file names are output verbatim
+    format_str = "--pretty=format:%H%x00%s%x00%ad%x00%ae"
+    # --shortstat is a single summary line per commit, much smaller than
+    # --numstat's line per file when file changes aren't needed
+    stat_arg = "--numstat" if numstat else "--shortstat"
+    cmd = ["git", "log", "-z", format_str, "--date=short", stat_arg, "--no-merges"]
     if diverged_from:
         cmd.extend([f"{diverged_from}..HEAD"])
-    cmd.extend(author_args + time_arg)
-    result = subprocess.run(cmd, capture_output=True, text=True)
-    output = result.stdout.strip()
-
-    if output:
-        commits, emails = parse_commit_output(output)
-        active_emails.update(emails)
-        all_commits.extend(commits)
-
-    if not all_commits:
-        return [], set()
-
-    return all_commits, active_emails
-
-
-def parse_commit_output(output):
-    """Parse the git log output into commit objects and collect active emails"""
-    commits = []
-    current_commit = None
-    active_emails = set()
-
-    for line in progressbar(output.split("\n"), prefix=" Parsing commits: "):
-        if "<sep>" in line:  # This is a commit header
-            if current_commit:
-                commits.append(current_commit)
-            parts = line.split("<sep>")
-            hash_id, subject, date, email = parts[:4]
-            current_commit = {
-                "hash": hash_id,
-                "subject": subject,
-                "date": date,
-                "files": [],
-            }
-            active_emails.add(email)
-        elif line.strip():  # This is a stat line
-            try:
-                added, deleted, filename = line.split("\t")
-                if added != "-" and deleted != "-":
-                    current_commit["files"].append(
-                        {"name": filename, "added": int(added), "deleted": int(deleted)}
-                    )
-            except ValueError:
-                continue
-
-    if current_commit:
-        commits.append(current_commit)
-
-    return commits, active_emails
-
+    # Author patterns are basic regexps, whatever grep.patternType says
+    cmd.extend(["--basic-regexp"] + author_args + time_arg)
+    # Let git skip commits that don't touch the requested paths
+    if paths:
+        cmd.extend(["--"] + paths)
+
+    cache_path = None
+    heads = (
+        resolve_revisions([diverged_from] if diverged_from else [])
+        if use_cache
+        else None
+    )
+    if heads:
+        cache_path = get_cache_path(cmd)
+        cache_stamp = get_cache_stamp(cmd, heads)
+        cached = load_cache(cache_path, cache_stamp)
+        if cached is not None:
+            return cached
+
+    # Stream git's output so parsing overlaps with the history walk and only
+    # one commit is held in flight at a time. The output is read as bytes, only
+    # the parts that are kept get decoded. Errors go to a file, so they can't
+    # fill a pipe nobody reads while the output is being read.
+    with tempfile.TemporaryFile() as stderr:
+        proc = subprocess.Popen(
+            cmd,
+            stdout=subprocess.PIPE,
+            stderr=stderr,
+            bufsize=1 << 20,
+        )
+        with proc:
+            for commit in parse_commit_output(read_records(proc.stdout), files, jobs):
+                active_emails.add(commit.email)
+                all_commits.append(commit)
+
+        # A failed or interrupted git log may have output no or only part of
+        # the history, don't report it as the whole one
+        if proc.returncode != 0:
+            stderr.seek(0)
+            raise subprocess.CalledProcessError(
+                proc.returncode, cmd, stderr=stderr.read()
+            )
 
-def parse_commit(commit: Dict) -> Optional[Dict]:
+    if cache_path:
+        save_cache(cache_path, cache_stamp, (all_commits, files, active_emails))
+
+    return all_commits, files, active_emails
+
+
+def read_records(stream, sep=b"\0", chunk_size=1 << 16):
+    """Read `sep` terminated records from a binary stream as they come"""
+    pending = b""
+    for chunk in iter(lambda: stream.read1(chunk_size), b""):
+        records = (pending + chunk).split(sep)
+        pending = records.pop()
+        yield from records
+    if pending:
+        yield pending
+
+
+def read_commit_blocks(records):
+    """Group NUL separated git log records into the list of records of each commit
+
+    A commit is made of its 4 header fields, the last one being followed on a
+    new line by the first numstat record, if any. The remaining numstat records
+    follow, up to an empty record. A --shortstat summary is fully contained in
+    the last header field.
+    """
+    records = iter(records)
+    for hash_id in records:
+        if not hash_id:
+            continue
+        block = [hash_id, *(next(records, b"") for _ in range(3))]
+        _, newline, stat = block[3].partition(b"\n")
+        if newline and not stat.startswith(b" "):
+            block.extend(takewhile(bool, records))
+        yield block
+
+
+def parse_commit_block(block):
+    """Parse the records of a single commit
+
+    Returns the commit object and its file changes as (names, added, deleted)
+    columns, with the file names left undecoded.
+    """
+    hash_id, subject, date, email = block[:4]
+    email, _, stat = email.partition(b"\n")
+    header = (
+        hash_id.decode(),
+        subject.decode(errors="replace"),
+        date.decode(),
+        email.decode(errors="replace"),
+    )
+    names, added, deleted = [], [], []
+
+    if stat.startswith(b" "):  # --shortstat summary line, no file changes
+        insertions = SHORTSTAT_INSERTIONS_RE.search(stat)
+        deletions = SHORTSTAT_DELETIONS_RE.search(stat)
+        commit = Commit(
+            *header,
+            int(insertions.group(1)) if insertions else 0,
+            int(deletions.group(1)) if deletions else 0,
+        )
+        return commit, (names, added, deleted)
+
+    stats = iter(block[4:])
+    while stat:
+        try:
+            file_added, file_deleted, filename = stat.split(b"\t", 2)
+            if not filename:  # Renamed file, the old and new paths follow
+                next(stats, b"")
+                filename = next(stats, b"")
+            if file_added != b"-" and file_deleted != b"-":
+                file_added, file_deleted = int(file_added), int(file_deleted)
+                names.append(filename)
+                added.append(file_added)
+                deleted.append(file_deleted)
+        except ValueError:
+            pass
+        stat = next(stats, b"")
+
+    commit = Commit(*header, sum(added), sum(deleted))
+    return commit, (names, added, deleted)
+
+
+def parse_commit_blocks(blocks):
+    """Parse the records of several commits, see parse_commit_block"""
+    return list(map(parse_commit_block, blocks))
+
+
+def parse_commit_blocks_in_pool(pool, blocks, jobs, batch_size=256):
+    """Parse commit blocks in a pool of `jobs` workers, yielding them in order
+
+    Blocks are sent in batches, a single commit is too little work to
+    outweigh the cost of passing it to a worker. Only a couple of batches
+    per worker are in flight, so the input is read as the workers keep up
+    instead of being buffered whole.
+    """
+    pending = deque()
+    for batch in iter(lambda: list(islice(blocks, batch_size)), []):
+        pending.append(pool.apply_async(parse_commit_blocks, (batch,)))
+        if len(pending) > 2 * jobs:
+            yield from pending.popleft().get()
+    while pending:
+        yield from pending.popleft().get()
+
+
+def parse_commit_output(records, files, jobs=1):
+    """Parse NUL separated git log records into commit objects, yielding them one by one
+
+    Each commit only keeps its added/deleted totals, its file changes are
+    appended to the columns of the `files` table. With several `jobs`, commit
+    blocks are parsed by a pool of worker processes, in order.
+    """
+    # Decode each distinct file name once and share it between commits
+    names = {}
+
+    blocks = progressbar(read_commit_blocks(records), prefix=" Parsing commits: ")
+    with Pool(jobs) if jobs > 1 else nullcontext() as pool:
+        if pool:
+            parsed = parse_commit_blocks_in_pool(pool, blocks, jobs)
+        else:
+            parsed = map(parse_commit_block, blocks)
+        for commit, (filenames, added, deleted) in parsed:
+            for filename in filenames:
+                name = names.get(filename)
+                if name is None:
+                    name = names[filename] = filename.decode(errors="replace")
+                files["name"].append(name)
+            files["added"].extend(added)
+            files["deleted"].extend(deleted)
+            yield commit
+
+
+def parse_commit(commit: Commit) -> ParsedCommit:
     """Parse a commit into structured format"""
-    if commit.get("subject", "").startswith("Merge branch"):
-        return None
-
-    parsed = {
-        "hash": commit["hash"],
-        "subject": commit["subject"],
-        "date": datetime.datetime.strptime(commit["date"], "%Y-%m-%d").date(),
-        "files": commit.get("files", []),
-        "added": sum(f["added"] for f in commit.get("files", [])),
-        "deleted": sum(f["deleted"] for f in commit.get("files", [])),
-    }
-
-    parsed["total_impact"] = max(0, parsed["added"] - parsed["deleted"])
-    return parsed
+    return ParsedCommit(
+        hash=commit.hash,
+        subject=commit.subject,
+        date=datetime.date.fromisoformat(commit.date),
+        added=commit.added,
+        deleted=commit.deleted,
+        category=categorize_commit(commit.subject),
+    )
 
 
 def categorize_commit(subject):
     """Basic categorization of commits based on common prefixes"""
     subject = subject.lower()
-    for category, keywords in COMMIT_CATEGORIES.items():
-        if any(word in subject for word in keywords):
+    for category, regex in CATEGORY_RES:
+        if regex.search(subject):
             return category
     return "Other"
 
 
 def get_directory_path(file_path, level=1):
     """Extract directory path up to specified level"""
-    parts = file_path.split("/")
+    if level == 1:
+        return file_path.partition("/")[0]
 
+    # Only split off the components that are kept
+    parts = file_path.split("/", level)
     if len(parts) > level:
         return "/".join(parts[:level])
-    return "/".join(parts)
-
-
-def group_files_by_directory(commit, dir_level):
-    """Group files in a commit by their directory"""
-    files_by_dir = defaultdict(list)
-
-    for file in commit.get("files", []):
-        directory = get_directory_path(file["name"], dir_level)
-        if directory:
-            files_by_dir[directory].append(file)
-
-    return files_by_dir
-
-
-def distribute_changes(commit, files_by_dir, dir_stats):
-    """Distribute commit changes by directory"""
-    for directory, files in files_by_dir.items():
-        dir_stats[directory]["files"].update(f["name"] for f in files)
-        dir_stats[directory]["added"] += sum(f["added"] for f in files)
-        dir_stats[directory]["deleted"] += sum(f["deleted"] for f in files)
+    return file_path
 
 
 def calculate_cocomo_stats(
@@ -340,30 +632,65 @@ def calculate_frequency_stats(commits, total_days):
         return "month", round(commits_per_month, 1)
 
 
-def format_directory_stats(dir_stats):
-    """Convert directory stats dict to sorted list by impact"""
+def format_directory_stats(dir_stats, limit=None):
+    """Convert directory stats dict to sorted list by impact, up to `limit` items"""
     dir_list = [
         {
             "name": directory,
-            "files": len(stats["files"]),
+            "files": stats["files"],
             "added": stats["added"],
             "deleted": stats["deleted"],
+            "changes": stats["added"] + stats["deleted"],
         }
         for directory, stats in dir_stats.items()
     ]
 
-    return sorted(dir_list, key=lambda x: x["added"] + x["deleted"], reverse=True)
-
-
-def analyze_directories(commits, dir_level=1):
-    """Analyze impact on directories"""
-    dir_stats = defaultdict(lambda: {"files": set(), "added": 0, "deleted": 0})
-
-    for commit in commits:
-        files_by_dir = group_files_by_directory(commit, dir_level)
-        distribute_changes(commit, files_by_dir, dir_stats)
-
-    return format_directory_stats(dir_stats)
+    if limit is None:
+        return sorted(dir_list, key=itemgetter("changes"), reverse=True)
+    return heapq.nlargest(limit, dir_list, key=itemgetter("changes"))
+
+
+def analyze_directories(files, dir_level=1, limit=None):
+    """Analyze impact on directories from the table of file changes"""
+    # Directories are numbered in order of appearance and their line counts are
+    # accumulated in flat lists indexed by that number
+    dir_ids = {}
+    dir_added = []
+    dir_deleted = []
+    # A file always belongs to the same directory, so its directory is only
+    # resolved the first time the file is seen. File names are shared string
+    # objects, so later lookups compare by identity. The distinct files are
+    # counted at the end.
+    file_dirs = {}
+
+    for name, added, deleted in zip(files["name"], files["added"], files["deleted"]):
+        dir_id = file_dirs.get(name)
+        if dir_id is None:
+            directory = get_directory_path(name, dir_level)
+            if not directory:
+                continue
+            dir_id = dir_ids.get(directory)
+            if dir_id is None:
+                dir_id = dir_ids[directory] = len(dir_added)
+                dir_added.append(0)
+                dir_deleted.append(0)
+            file_dirs[name] = dir_id
+        dir_added[dir_id] += added
+        dir_deleted[dir_id] += deleted
+
+    dir_files = [0] * len(dir_ids)
+    for dir_id in file_dirs.values():
+        dir_files[dir_id] += 1
+
+    dir_stats = {
+        directory: {
+            "files": dir_files[dir_id],
+            "added": dir_added[dir_id],
+            "deleted": dir_deleted[dir_id],
+        }
+        for directory, dir_id in dir_ids.items()
+    }
+    return format_directory_stats(dir_stats, limit)
 
 
 def generate_summary(
@@ -378,37 +705,53 @@ def generate_summary(
     yearly_salary=50000,
     pure_cocomo=False,
     incremental_cocomo=False,
+    paths=None,
+    use_cache=True,
+    jobs=1,
 ):
-    if email_contains:
-        emails = get_emails_by_pattern(email_contains)
-    commits, active_emails = get_user_commits(
-        emails, days, weeks, months, years, with_files=True, diverged_from=diverged_from
+    commits, files, active_emails = get_user_commits(
+        emails,
+        email_contains,
+        days,
+        weeks,
+        months,
+        years,
+        diverged_from=diverged_from,
+        paths=paths,
+        use_cache=use_cache,
+        # The file changes are only needed for the directory impact
+        numstat=dir_level != 0,
+        jobs=jobs,
     )
-    if not commits or (len(commits) == 1 and not commits[0]):
+    if not commits:
         print("No commits found")
         return
 
-    parsed_commits = [parse_commit(c) for c in commits if parse_commit(c)]
+    parsed_commits = [parse_commit(c) for c in commits]
 
-    # Group by date
+    # Group by date and category, and total the lines changed in a single pass
     commits_by_date = defaultdict(list)
+    categories = defaultdict(lambda: {"count": 0, "added": 0, "deleted": 0})
+    total_added = total_deleted = total_impact = 0
     for commit in parsed_commits:
-        commits_by_date[commit["date"]].append(commit)
-
-    # Group by category
-    categories = defaultdict(int)
-    for commit in parsed_commits:
-        category = categorize_commit(commit["subject"])
-        categories[category] += 1
-
-    # Print summary
-    print(f"\n{Colors.CYAN}=== Git Commit Summary ==={Colors.RESET}\n")
+        commits_by_date[commit.date].append(commit)
+        stats = categories[commit.category]
+        stats["count"] += 1
+        stats["added"] += commit.added
+        stats["deleted"] += commit.deleted
+        total_added += commit.added
+        total_deleted += commit.deleted
+        total_impact += commit.total_impact
+
+    # Build the summary and write it at once
+    out = []
+    out.append(f"\n{Colors.CYAN}=== Git Commit Summary ==={Colors.RESET}\n")
 
     if active_emails:
-        print(f"{Colors.BLUE}Commits by:{Colors.RESET}", ", ".join(active_emails))
+        out.append(f"{Colors.BLUE}Commits by:{Colors.RESET} {', '.join(active_emails)}")
     else:
-        print(f"{Colors.BLUE}Commits by:{Colors.RESET} no active users found")
-    print(f"\n{Colors.BLUE}Total commits:{Colors.RESET}", len(parsed_commits))
+        out.append(f"{Colors.BLUE}Commits by:{Colors.RESET} no active users found")
+    out.append(f"\n{Colors.BLUE}Total commits:{Colors.RESET} {len(parsed_commits)}")
 
     # Calculate commit frequency
     if days:
@@ -418,32 +761,22 @@ def generate_summary(
     elif years:
         total_days = years * 365
     else:
-        total_days = (
-            max(c["date"] for c in parsed_commits)
-            - min(c["date"] for c in parsed_commits)
-        ).days + 1
+        total_days = (max(commits_by_date) - min(commits_by_date)).days + 1
 
     period, frequency = calculate_frequency_stats(parsed_commits, total_days)
     if period and frequency:
-        print(f"{Colors.BLUE}Commit frequency:{Colors.RESET} {frequency} per {period}")
+        out.append(
+            f"{Colors.BLUE}Commit frequency:{Colors.RESET} {frequency} per {period}"
+        )
 
-    # Calculate total lines changed
-    total_added = sum(commit["added"] for commit in parsed_commits)
-    total_deleted = sum(commit["deleted"] for commit in parsed_commits)
-    total_impact = sum(commit["total_impact"] for commit in parsed_commits)
-    print(
+    out.append(
         f"{Colors.BLUE}Lines changed:{Colors.RESET} {Colors.GREEN}+{total_added}{Colors.RESET} {Colors.RED}-{total_deleted}{Colors.RESET}"
     )
 
-    print(f"\n{Colors.BLUE}Commits by category:{Colors.RESET}")
-    for category, count in sorted(categories.items()):
-        category_commits = [
-            c for c in parsed_commits if categorize_commit(c["subject"]) == category
-        ]
-        category_added = sum(c["added"] for c in category_commits)
-        category_deleted = sum(c["deleted"] for c in category_commits)
-        print(
-            f"    {Colors.YELLOW}{category}:{Colors.RESET} {count} commits ({Colors.GREEN}+{category_added}{Colors.RESET} {Colors.RED}-{category_deleted}{Colors.RESET})"
+    out.append(f"\n{Colors.BLUE}Commits by category:{Colors.RESET}")
+    for category, stats in sorted(categories.items()):
+        out.append(
+            f"    {Colors.YELLOW}{category}:{Colors.RESET} {stats['count']} commits ({Colors.GREEN}+{stats['added']}{Colors.RESET} {Colors.RED}-{stats['deleted']}{Colors.RESET})"
         )
 
     # Calculate and display COCOMO metrics if requested
@@ -451,62 +784,73 @@ def generate_summary(
         cocomo = calculate_cocomo_stats(
             total_added, total_deleted, yearly_salary, pure_cocomo, total_impact
         )
-        print(f"\n{Colors.BLUE}COCOMO Estimates (Basic, Organic):{Colors.RESET}")
-        print(
+        out.append(f"\n{Colors.BLUE}COCOMO Estimates (Basic, Organic):{Colors.RESET}")
+        out.append(
             f"    {Colors.YELLOW}Lines considered:{Colors.RESET} {total_impact if not pure_cocomo else max(0, total_added - total_deleted):,}"
         )
-        print(
+        out.append(
             f"    {Colors.YELLOW}Effort:{Colors.RESET} {cocomo['effort']} person-months"
         )
-        print(
+        out.append(
             f"    {Colors.YELLOW}Development time:{Colors.RESET} {cocomo['time']} months"
         )
-        print(
+        out.append(
             f"    {Colors.YELLOW}Average staff needed:{Colors.RESET} {cocomo['staff']} people"
         )
-        print(f"    {Colors.YELLOW}Estimated cost:{Colors.RESET} €{cocomo['cost']:,}")
+        out.append(
+            f"    {Colors.YELLOW}Estimated cost:{Colors.RESET} €{cocomo['cost']:,}"
+        )
 
     # Show commits with most changes
-    print(f"\n{Colors.BLUE}Heavy changes (top 5):{Colors.RESET}")
-    heavy_commits = sorted(
-        parsed_commits, key=lambda x: x["added"] + x["deleted"], reverse=True
-    )[:5]
+    out.append(f"\n{Colors.BLUE}Heavy changes (top 5):{Colors.RESET}")
+    heavy_commits = heapq.nlargest(5, parsed_commits, key=attrgetter("changes"))
     for commit in heavy_commits:
-        total_changes = commit["added"] + commit["deleted"]
-        print(
-            f"    {Colors.YELLOW}{commit['hash'][:7]}{Colors.RESET} {commit['subject']} ({total_changes} lines: {Colors.GREEN}+{commit['added']}{Colors.RESET} {Colors.RED}-{commit['deleted']}{Colors.RESET})"
+        out.append(
+            f"    {Colors.YELLOW}{commit.hash[:7]}{Colors.RESET} {commit.subject} ({commit.changes} lines: {Colors.GREEN}+{commit.added}{Colors.RESET} {Colors.RED}-{commit.deleted}{Colors.RESET})"
         )
 
-    print(f"\n{Colors.BLUE}Recent activity:{Colors.RESET}")
-    for date in sorted(commits_by_date.keys(), reverse=True)[:5]:
-        print(f"    {Colors.CYAN}{date}:{Colors.RESET}")
+    out.append(f"\n{Colors.BLUE}Recent activity:{Colors.RESET}")
+    for date in heapq.nlargest(5, commits_by_date):
+        out.append(f"    {Colors.CYAN}{date}:{Colors.RESET}")
         for commit in commits_by_date[date]:
-            print(
-                f"        {Colors.YELLOW}{commit['hash'][:7]}{Colors.RESET} {commit['subject']} ({Colors.GREEN}+{commit['added']}{Colors.RESET} {Colors.RED}-{commit['deleted']}{Colors.RESET})"
+            out.append(
+                f"        {Colors.YELLOW}{commit.hash[:7]}{Colors.RESET} {commit.subject} ({Colors.GREEN}+{commit.added}{Colors.RESET} {Colors.RED}-{commit.deleted}{Colors.RESET})"
             )
 
     # Show directory impact (top 10)
-    directories = analyze_directories(parsed_commits, dir_level)
+    directories = analyze_directories(files, dir_level, limit=10)
     if directories:
-        print(f"\n{Colors.BLUE}Files impact (top 10, level {dir_level}):{Colors.RESET}")
-        for directory in directories[:10]:
-            print(
+        out.append(
+            f"\n{Colors.BLUE}Files impact (top 10, level {dir_level}):{Colors.RESET}"
+        )
+        for directory in directories:
+            out.append(
                 f"    {Colors.YELLOW}{directory['name']}:{Colors.RESET} {directory['files']} files changed {Colors.GREEN}+{directory['added']}{Colors.RESET} {Colors.RED}-{directory['deleted']}{Colors.RESET}"
             )
 
+    sys.stdout.write("\n".join(out) + "\n")
+
 
 if __name__ == "__main__":
     args = parse_args()
-    generate_summary(
-        args.emails,
-        args.email_contains,
-        args.days,
-        args.weeks,
-        args.months,
-        args.years,
-        args.dir_level,
-        args.diverged_from,
-        args.salary,
-        args.pure_cocomo,
-        args.incremental_cocomo,
-    )
+    try:
+        generate_summary(
+            args.emails,
+            args.email_contains,
+            args.days,
+            args.weeks,
+            args.months,
+            args.years,
+            args.dir_level,
+            args.diverged_from,
+            args.salary,
+            args.pure_cocomo,
+            args.incremental_cocomo,
+            args.paths,
+            not args.no_cache,
+            args.jobs,
+        )
+    except subprocess.CalledProcessError as error:
+        # Show why git failed rather than an empty summary
+        message = error.stderr.decode(errors="replace").strip()
+        sys.exit(message or str(error))
@@ -7,7 +7,7 @@ _git_summary() {
     prev="${COMP_WORDS[COMP_CWORD-1]}"
 
     # All available options
-    opts="--emails -e --email-contains -ec --days -d --weeks -w --months -m --years -y --dir-level -dl --diverged-from -df --salary -s --pure-cocomo -p --incremental-cocomo -ic"
+    opts="--emails -e --email-contains -ec --days -d --weeks -w --months -m --years -y --dir-level -dl --paths -P --diverged-from -df --salary -s --pure-cocomo -p --incremental-cocomo -ic --jobs -j --no-cache -nc"
 
     # Handle option arguments
     case "${prev}" in
@@ -16,10 +16,15 @@ _git_summary() {
             COMPREPLY=( $(compgen -W "$(git log --format='%ae' | sort -u)" -- ${cur}) )
             return 0
             ;;
-        --email-contains|-ec|--salary|-s|--days|-d|--weeks|-w|--months|-m|--years|-y|--dir-level|-dl)
+        --email-contains|-ec|--salary|-s|--days|-d|--weeks|-w|--months|-m|--years|-y|--dir-level|-dl|--jobs|-j)
             # These options expect numeric values, no completion needed
             return 0
             ;;
+        --paths|-P)
+            # Complete with files and directories
+            COMPREPLY=( $(compgen -f -- ${cur}) )
+            return 0
+            ;;
         --diverged-from|-df)
             # Complete with git branches
             COMPREPLY=( $(compgen -W "$(git branch --format='%(refname:short)')" -- ${cur}) )